@@ -6,6 +6,11 @@ from streamlit_option_menu import option_menu
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from utils.cache import cached
+from utils.data import data_version, load_data
+from utils.lod import MAX_POINTS, lod_controls, lump_others, paged_dataframe, top_k_with_others
+from utils.progressive import ProgressiveRenderer, progressive_toggle, render_plotly
+from utils.temporal import GRANULARIDADES, build_rollups, has_dates
 
 # Configuración de página DEBE ir al principio
 st.set_page_config(
@@ -35,6 +40,18 @@ st.markdown("""
         padding-bottom: 0.5rem;
         margin: 2rem 0 1rem 0;
     }
+
+    .skeleton {
+        background: linear-gradient(90deg, #f0f2f6 25%, #e2e5ea 50%, #f0f2f6 75%);
+        background-size: 200% 100%;
+        animation: skeleton-pulse 1.5s ease-in-out infinite;
+        border-radius: 10px;
+    }
+    
+    @keyframes skeleton-pulse {
+        0% { background-position: 200% 0; }
+        100% { background-position: -200% 0; }
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -63,13 +80,19 @@ if selected == "Inicio":
 elif selected == "Mapa":
     st.switch_page("pages/3_Mapa.py")
 
-# Cargar datos
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/turismo_nacional.csv")
+# Nivel de detalle de gráficos y tablas
+top_k = lod_controls("dashboard")
+
+# Los gráficos pesados se calculan en paralelo y se dibujan al terminar
+renderer = ProgressiveRenderer(enabled=progressive_toggle("dashboard"))
 
+# Cargar datos (caché compartida con presupuesto de memoria, ver utils/cache.py)
+version = data_version()
 data = load_data()
-data_grouped = data.groupby(['Departamento', 'Destino', 'Temporada'])['Visitantes'].mean().reset_index()
+data_grouped = cached(
+    "aggregate", (version, "dashboard_grouped"),
+    lambda: data.groupby(['Departamento', 'Destino', 'Temporada'], observed=True)['Visitantes'].mean().reset_index()
+)
 
 # Header principal
 st.title("📊 Dashboard Analítico - Turismo Nacional")
@@ -163,38 +186,45 @@ data_filtrado["Departamento"] = data_filtrado["Departamento"].fillna(departament
 data_filtrado["Temporada"] = data_filtrado["Temporada"].fillna(temporada_sel)
 data_filtrado["Visitantes"] = data_filtrado["Visitantes"].fillna(0)
 
-# Gráfico de barras mejorado
-fig_barras = px.bar(
-    data_filtrado,
-    x="Destino",
-    y="Visitantes",
-    title=f"Visitantes por Destino en {departamento_sel} - Temporada {temporada_sel}",
-    color="Visitantes",
-    color_continuous_scale="viridis",
-    text="Visitantes",
-    hover_data={"Destino": True, "Visitantes": ":.0f"}
-)
+# Gráfico de barras mejorado (Top-K + Otros en modo LOD)
+def build_fig_barras():
+    data_barras = top_k_with_others(data_filtrado, "Destino", "Visitantes", top_k) if top_k else data_filtrado
+    fig_barras = px.bar(
+        data_barras,
+        x="Destino",
+        y="Visitantes",
+        title=f"Visitantes por Destino en {departamento_sel} - Temporada {temporada_sel}",
+        color="Visitantes",
+        color_continuous_scale="viridis",
+        text="Visitantes",
+        hover_data={"Destino": True, "Visitantes": ":.0f"}
+    )
 
-fig_barras.update_traces(
-    texttemplate='%{text:.0f}',
-    textposition='outside',
-    marker_line_color='black',
-    marker_line_width=1,
-    hovertemplate="<b>%{x}</b><br>Visitantes: %{y:.0f}<extra></extra>"
-)
+    fig_barras.update_traces(
+        texttemplate='%{text:.0f}',
+        textposition='outside',
+        marker_line_color='black',
+        marker_line_width=1,
+        hovertemplate="<b>%{x}</b><br>Visitantes: %{y:.0f}<extra></extra>"
+    )
 
-fig_barras.update_layout(
-    xaxis_title="Destinos Turísticos",
-    yaxis_title="Número de Visitantes",
-    xaxis_tickangle=-45,
-    plot_bgcolor='rgba(0,0,0,0)',
-    paper_bgcolor='rgba(0,0,0,0)',
-    font=dict(size=12),
-    height=500,
-    showlegend=False
-)
+    fig_barras.update_layout(
+        xaxis_title="Destinos Turísticos",
+        yaxis_title="Número de Visitantes",
+        xaxis_tickangle=-45,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12),
+        height=500,
+        showlegend=False
+    )
+    return fig_barras
 
-st.plotly_chart(fig_barras, use_container_width=True)
+renderer.add(
+    lambda: cached("figure", (version, "dashboard_barras", departamento_sel, temporada_sel, top_k), build_fig_barras),
+    render_plotly,
+    height=500
+)
 st.caption(f"Distribución de visitantes por tipo de destino en {departamento_sel} durante temporada {temporada_sel}")
 
 # ========== SECCIÓN 3: ANÁLISIS COMPARATIVO ==========
@@ -207,8 +237,9 @@ with col_tab1:
     st.subheader("Datos Detallados")
     data_filtrado_display = data_filtrado.copy()
     data_filtrado_display['Visitantes'] = data_filtrado_display['Visitantes'].astype(int)
-    st.dataframe(
+    paged_dataframe(
         data_filtrado_display,
+        key="dashboard_tabla_pagina",
         use_container_width=True,
         hide_index=True
     )
@@ -239,39 +270,48 @@ with col_box1:
         help="Analiza la distribución de visitantes por destino en esta temporada"
     )
 
-# Preparar datos para boxplot
-data_boxplot = data[data['Temporada'] == temporada_boxplot]
-
 # Crear boxplot interactivo mejorado
-fig_boxplot = px.box(
-    data_boxplot,
-    x="Destino",
-    y="Visitantes",
-    color="Destino",
-    title=f"Distribución de Visitantes por Destino - Temporada {temporada_boxplot}",
-    points="all",
-    hover_data=["Departamento"],
-    color_discrete_sequence=px.colors.qualitative.Set3
-)
+def build_fig_boxplot():
+    # Preparar datos para boxplot
+    data_boxplot = data[data['Temporada'] == temporada_boxplot]
+    if top_k:
+        data_boxplot = lump_others(data_boxplot, "Destino", "Visitantes", top_k)
+
+    fig_boxplot = px.box(
+        data_boxplot,
+        x="Destino",
+        y="Visitantes",
+        color="Destino",
+        title=f"Distribución de Visitantes por Destino - Temporada {temporada_boxplot}",
+        # Con muchas filas solo se envían los atípicos
+        points="all" if len(data_boxplot) <= MAX_POINTS else "outliers",
+        hover_data=["Departamento"],
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
 
-fig_boxplot.update_layout(
-    xaxis_title="Destinos Turísticos",
-    yaxis_title="Número de Visitantes",
-    xaxis_tickangle=-45,
-    plot_bgcolor='rgba(0,0,0,0)',
-    paper_bgcolor='rgba(0,0,0,0)',
-    font=dict(size=12),
-    height=600,
-    showlegend=False
-)
+    fig_boxplot.update_layout(
+        xaxis_title="Destinos Turísticos",
+        yaxis_title="Número de Visitantes",
+        xaxis_tickangle=-45,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12),
+        height=600,
+        showlegend=False
+    )
 
-fig_boxplot.update_traces(
-    marker=dict(size=6, opacity=0.7, line=dict(width=1, color='DarkSlateGrey')),
-    line=dict(width=2),
-    hovertemplate="<b>%{x}</b><br>Departamento: %{customdata[0]}<br>Visitantes: %{y:.0f}<extra></extra>"
-)
+    fig_boxplot.update_traces(
+        marker=dict(size=6, opacity=0.7, line=dict(width=1, color='DarkSlateGrey')),
+        line=dict(width=2),
+        hovertemplate="<b>%{x}</b><br>Departamento: %{customdata[0]}<br>Visitantes: %{y:.0f}<extra></extra>"
+    )
+    return fig_boxplot
 
-st.plotly_chart(fig_boxplot, use_container_width=True)
+renderer.add(
+    lambda: cached("figure", (version, "dashboard_boxplot", temporada_boxplot, top_k), build_fig_boxplot),
+    render_plotly,
+    height=600
+)
 st.caption(f"Distribución de visitantes entre diferentes destinos en temporada {temporada_boxplot}. Cada punto representa un departamento específico")
 
 # ========== SECCIÓN 5: ANÁLISIS ADICIONAL ==========
@@ -282,31 +322,124 @@ col_anal1, col_anal2 = st.columns(2)
 
 with col_anal1:
     st.subheader("🏆 Top 5 Departamentos")
-    top_deptos = data.groupby('Departamento')['Visitantes'].sum().nlargest(5).reset_index()
-    fig_top = px.bar(
-        top_deptos,
-        x='Visitantes',
-        y='Departamento',
-        orientation='h',
-        title="Departamentos con Más Visitantes",
-        color='Visitantes',
-        color_continuous_scale='teal'
-    )
-    fig_top.update_layout(height=300)
-    st.plotly_chart(fig_top, use_container_width=True)
+
+    def build_fig_top():
+        top_deptos = cached(
+            "aggregate", (version, "dashboard_top_deptos"),
+            lambda: data.groupby('Departamento', observed=True)['Visitantes'].sum().nlargest(5).reset_index()
+        )
+        fig_top = px.bar(
+            top_deptos,
+            x='Visitantes',
+            y='Departamento',
+            orientation='h',
+            title="Departamentos con Más Visitantes",
+            color='Visitantes',
+            color_continuous_scale='teal'
+        )
+        fig_top.update_layout(height=300)
+        return fig_top
+
+    renderer.add(lambda: cached("figure", (version, "dashboard_top"), build_fig_top), render_plotly, height=300)
 
 with col_anal2:
     st.subheader("🌤️ Visitantes por Temporada")
-    temp_stats = data.groupby('Temporada')['Visitantes'].sum().reset_index()
-    fig_temp = px.pie(
-        temp_stats,
-        values='Visitantes',
-        names='Temporada',
-        title="Distribución por Temporada",
-        color_discrete_sequence=px.colors.qualitative.Pastel
-    )
-    fig_temp.update_layout(height=300)
-    st.plotly_chart(fig_temp, use_container_width=True)
+
+    def build_fig_temp():
+        temp_stats = cached(
+            "aggregate", (version, "dashboard_temp_stats"),
+            lambda: data.groupby('Temporada', observed=True)['Visitantes'].sum().reset_index()
+        )
+        fig_temp = px.pie(
+            temp_stats,
+            values='Visitantes',
+            names='Temporada',
+            title="Distribución por Temporada",
+            color_discrete_sequence=px.colors.qualitative.Pastel
+        )
+        fig_temp.update_layout(height=300)
+        return fig_temp
+
+    renderer.add(lambda: cached("figure", (version, "dashboard_temp"), build_fig_temp), render_plotly, height=300)
+
+# ========== SECCIÓN 6: EVOLUCIÓN TEMPORAL ==========
+# Solo disponible cuando los datos traen registros fechados (columna Fecha)
+if has_dates(data):
+    st.markdown('<h3 class="section-header">📅 Evolución Temporal</h3>', unsafe_allow_html=True)
+
+    # Rollups de día/semana/mes/año con sumas prefijas: cada rango se responde en O(1)
+    rollups = cached("aggregate", (version, "dashboard_rollups"), lambda: build_rollups(data))
+    rollup_dia = rollups["Día"]
+    fecha_min = rollup_dia.periods[0].start_time.date()
+    fecha_max = rollup_dia.periods[-1].start_time.date()
+
+    col_fecha1, col_fecha2 = st.columns([3, 1])
+
+    with col_fecha1:
+        rango_fechas = st.date_input(
+            "Rango de fechas",
+            value=(fecha_min, fecha_max),
+            min_value=fecha_min,
+            max_value=fecha_max,
+            key="dashboard_rango_fechas",
+            help="Filtra los visitantes registrados entre estas fechas"
+        )
+
+    with col_fecha2:
+        granularidad = st.selectbox(
+            "Granularidad",
+            list(GRANULARIDADES),
+            index=2,
+            key="dashboard_granularidad"
+        )
+
+    # Mientras se elige el rango, st.date_input devuelve una sola fecha
+    fecha_ini, fecha_fin = rango_fechas if len(rango_fechas) == 2 else (rango_fechas[0], rango_fechas[0])
+
+    totales_rango = rollup_dia.range_totals(fecha_ini, fecha_fin)
+    serie = rollups[granularidad].series(fecha_ini, fecha_fin)
+
+    col_tm1, col_tm2, col_tm3 = st.columns(3)
+
+    with col_tm1:
+        st.metric("Visitantes en el Rango", f"{totales_rango['Visitantes'].sum():,}")
+
+    with col_tm2:
+        st.metric("Días en el Rango", (fecha_fin - fecha_ini).days + 1)
+
+    with col_tm3:
+        st.metric(f"Periodos ({granularidad})", len(serie))
+
+    col_serie1, col_serie2 = st.columns(2)
+
+    with col_serie1:
+        fig_serie = px.line(
+            serie,
+            x="Fecha",
+            y="Visitantes",
+            title=f"Visitantes por {granularidad.lower()}",
+            markers=True
+        )
+        fig_serie.update_layout(height=400)
+        st.plotly_chart(fig_serie, use_container_width=True)
+        if granularidad != "Día":
+            st.caption("Los periodos de los extremos se cuentan completos")
+
+    with col_serie2:
+        totales_depto = totales_rango.groupby("Departamento")["Visitantes"].sum().reset_index()
+        if top_k:
+            totales_depto = top_k_with_others(totales_depto, "Departamento", "Visitantes", top_k)
+        fig_rango = px.bar(
+            totales_depto.sort_values("Visitantes", ascending=True),
+            x="Visitantes",
+            y="Departamento",
+            orientation="h",
+            title="Visitantes por Departamento en el Rango",
+            color="Visitantes",
+            color_continuous_scale="viridis"
+        )
+        fig_rango.update_layout(height=400)
+        st.plotly_chart(fig_rango, use_container_width=True)
 
 # Footer
 st.markdown("---")
@@ -315,4 +448,7 @@ st.markdown(
     "Dashboard desarrollado con Streamlit • Datos: Turismo Nacional Colombia"
     "</div>", 
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+# Rellenar los placeholders de los gráficos pesados
+renderer.run()
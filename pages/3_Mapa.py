@@ -1,10 +1,19 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import folium
-from streamlit_folium import st_folium
+import streamlit.components.v1 as components
 from branca.colormap import LinearColormap
 from streamlit_option_menu import option_menu
 import plotly.express as px
+from utils.cache import cached
+from utils.data import data_version, load_coordinates, load_data
+from utils.geo import (
+    GEOJSON_PATH, ZOOM_TOLERANCES, choropleth_map, choropleth_values, geojson_available, get_geometry,
+    get_join_index
+)
+from utils.lod import lod_controls, paged_dataframe, top_k_with_others
+from utils.progressive import ProgressiveRenderer, progressive_toggle, render_plotly
 
 # Configuración de página DEBE ir al principio
 st.set_page_config(
@@ -42,6 +51,18 @@ st.markdown("""
         padding-bottom: 0.5rem;
         margin: 2rem 0 1rem 0;
     }
+
+    .skeleton {
+        background: linear-gradient(90deg, #f0f2f6 25%, #e2e5ea 50%, #f0f2f6 75%);
+        background-size: 200% 100%;
+        animation: skeleton-pulse 1.5s ease-in-out infinite;
+        border-radius: 10px;
+    }
+    
+    @keyframes skeleton-pulse {
+        0% { background-position: 200% 0; }
+        100% { background-position: -200% 0; }
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -70,6 +91,12 @@ if selected == "Inicio":
 elif selected == "Dashboard":
     st.switch_page("pages/2_Dashboard.py")
 
+# Nivel de detalle de gráficos y tablas
+top_k = lod_controls("mapa")
+
+# El mapa y los gráficos pesados se calculan en paralelo y se dibujan al terminar
+renderer = ProgressiveRenderer(enabled=progressive_toggle("mapa"))
+
 # Header principal
 st.markdown("""
 <div class="map-header">
@@ -78,15 +105,16 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Cargar datos con cache
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/turismo_nacional.csv")
-
+# Cargar datos (caché compartida con presupuesto de memoria, ver utils/cache.py)
+version = data_version()
 data = load_data()
 
-# Agrupar y calcular promedio de visitantes
-data_grouped = data.groupby(['Departamento', 'Destino', 'Temporada', 'Latitud', 'Longitud'])['Visitantes'].mean().reset_index()
+# Agrupar y calcular promedio de visitantes; las coordenadas vienen de la tabla por Departamento
+data_grouped = cached(
+    "aggregate", (version, "mapa_grouped"),
+    lambda: data.groupby(['Departamento', 'Destino', 'Temporada'], observed=True)['Visitantes'].mean().reset_index()
+    .merge(load_coordinates(), on='Departamento')
+)
 
 # ========== SECCIÓN 1: FILTROS Y CONTROLES ==========
 st.markdown('<h3 class="section-header">🎛️ Controles del Mapa</h3>', unsafe_allow_html=True)
@@ -131,6 +159,30 @@ with col_filt4:
         help="Controla la transparencia de los círculos"
     )
 
+col_modo1, col_modo2 = st.columns(2)
+
+with col_modo1:
+    modo_mapa = st.radio(
+        "Tipo de mapa",
+        ["Puntos", "Coropletas"],
+        horizontal=True,
+        help="Círculos por departamento o polígonos coloreados según visitantes"
+    )
+
+with col_modo2:
+    # El zoom inicial define cuánto se simplifican los polígonos
+    zoom_mapa = st.select_slider(
+        "Zoom inicial (coropletas)",
+        options=list(ZOOM_TOLERANCES),
+        value=5,
+        disabled=modo_mapa != "Coropletas",
+        help="A mayor zoom, polígonos más detallados"
+    )
+
+if modo_mapa == "Coropletas" and not geojson_available():
+    st.info(f"ℹ️ No se encontró la geometría de departamentos ({GEOJSON_PATH}). Se muestra el mapa de puntos.")
+    modo_mapa = "Puntos"
+
 # ========== SECCIÓN 2: MÉTRICAS RÁPIDAS ==========
 st.markdown('<h3 class="section-header">📊 Resumen de Datos Filtrados</h3>', unsafe_allow_html=True)
 
@@ -177,75 +229,122 @@ with col_met4:
 # ========== SECCIÓN 3: MAPA INTERACTIVO ==========
 st.markdown('<h3 class="section-header">🗺️ Visualización en Mapa</h3>', unsafe_allow_html=True)
 
+# Coropletas: la geometría simplificada y el índice por nombre se cachean;
+# con cada filtro solo se calcula el array de valores por polígono
+if modo_mapa == "Coropletas" and not data_filtrado.empty:
+    indice = get_join_index(data_grouped['Departamento'].unique())
+    valores = choropleth_values(data_filtrado, indice, len(get_geometry(zoom_mapa)['features']))
+    sin_poligono = sorted(set(data_grouped['Departamento'].astype(str)) - set(indice))
+
+    if np.isnan(valores).all():
+        st.info(
+            f"ℹ️ Ningún departamento filtrado coincide con los polígonos de {GEOJSON_PATH}. "
+            "Se muestra el mapa de puntos."
+        )
+        modo_mapa = "Puntos"
+    if sin_poligono:
+        st.caption(f"Departamentos sin polígono en la geometría: {', '.join(sin_poligono)}")
+
 if data_filtrado.empty:
     st.warning("⚠️ No hay datos disponibles para la combinación seleccionada. Por favor, ajusta los filtros.")
 else:
-    # Crear mapa base
-    m = folium.Map(
-        location=[4.6097, -74.0818], 
-        zoom_start=5,
-        tiles='OpenStreetMap',  # Puedes cambiar a 'CartoDB positron' para un estilo más claro
-        control_scale=True
-    )
-
-    # Crear escala de colores mejorada
-    min_val, max_val = data_filtrado['Visitantes'].min(), data_filtrado['Visitantes'].max()
-    
-    # Escala de colores más atractiva
-    colormap = LinearColormap(
-        colors=["#2E8B57", "#FFD700", "#FF4500"],  # Verde -> Amarillo -> Rojo
-        vmin=min_val, 
-        vmax=max_val,
-        caption=f'Rango de Visitantes ({destino_sel} - {temporada_sel})'
-    )
+    # El HTML del mapa se cachea por combinación de filtros y estilo
+    def build_map_html():
+        # Crear mapa base
+        m = folium.Map(
+            location=[4.6097, -74.0818], 
+            zoom_start=5,
+            tiles='OpenStreetMap',  # Puedes cambiar a 'CartoDB positron' para un estilo más claro
+            control_scale=True
+        )
 
-    # Añadir círculos al mapa con mejoras
-    for _, row in data_filtrado.iterrows():
-        # Calcular radio proporcional (evitar círculos demasiado pequeños/grandes)
-        radius = max(5, min(50, row['Visitantes'] / escala_marcadores))
+        # Crear escala de colores mejorada
+        min_val, max_val = data_filtrado['Visitantes'].min(), data_filtrado['Visitantes'].max()
         
-        folium.CircleMarker(
-            location=[row['Latitud'], row['Longitud']],
-            radius=radius,
-            color=colormap(row['Visitantes']),
-            fill=True,
-            fill_color=colormap(row['Visitantes']),
-            fill_opacity=opacidad,
-            weight=2,
-            popup=folium.Popup(
-                f"""
-                <div style="font-family: Arial; min-width: 200px;">
-                    <h4 style="margin:0; color: #1f77b4;">{row['Departamento']}</h4>
-                    <hr style="margin: 5px 0;">
-                    <p style="margin:2px 0;"><strong>Destino:</strong> {row['Destino']}</p>
-                    <p style="margin:2px 0;"><strong>Temporada:</strong> {row['Temporada']}</p>
-                    <p style="margin:2px 0;"><strong>Visitantes:</strong> {row['Visitantes']:,.0f}</p>
-                    <p style="margin:2px 0;"><strong>Coordenadas:</strong> {row['Latitud']:.4f}, {row['Longitud']:.4f}</p>
-                </div>
-                """,
-                max_width=300
-            ),
-            tooltip=f"{row['Departamento']}: {row['Visitantes']:,.0f} visitantes"
-        ).add_to(m)
-
-    # Añadir leyenda al mapa
-    colormap.add_to(m)
-
-    # Añadir control de capas
-    folium.LayerControl().add_to(m)
+        # Escala de colores más atractiva
+        colormap = LinearColormap(
+            colors=["#2E8B57", "#FFD700", "#FF4500"],  # Verde -> Amarillo -> Rojo
+            vmin=min_val, 
+            vmax=max_val,
+            caption=f'Rango de Visitantes ({destino_sel} - {temporada_sel})'
+        )
+
+        # Añadir círculos al mapa con mejoras
+        for _, row in data_filtrado.iterrows():
+            # Calcular radio proporcional (evitar círculos demasiado pequeños/grandes)
+            radius = max(5, min(50, row['Visitantes'] / escala_marcadores))
+            
+            folium.CircleMarker(
+                location=[row['Latitud'], row['Longitud']],
+                radius=radius,
+                color=colormap(row['Visitantes']),
+                fill=True,
+                fill_color=colormap(row['Visitantes']),
+                fill_opacity=opacidad,
+                weight=2,
+                popup=folium.Popup(
+                    f"""
+                    <div style="font-family: Arial; min-width: 200px;">
+                        <h4 style="margin:0; color: #1f77b4;">{row['Departamento']}</h4>
+                        <hr style="margin: 5px 0;">
+                        <p style="margin:2px 0;"><strong>Destino:</strong> {row['Destino']}</p>
+                        <p style="margin:2px 0;"><strong>Temporada:</strong> {row['Temporada']}</p>
+                        <p style="margin:2px 0;"><strong>Visitantes:</strong> {row['Visitantes']:,.0f}</p>
+                        <p style="margin:2px 0;"><strong>Coordenadas:</strong> {row['Latitud']:.4f}, {row['Longitud']:.4f}</p>
+                    </div>
+                    """,
+                    max_width=300
+                ),
+                tooltip=f"{row['Departamento']}: {row['Visitantes']:,.0f} visitantes"
+            ).add_to(m)
+
+        # Añadir leyenda al mapa
+        colormap.add_to(m)
+
+        # Añadir control de capas
+        folium.LayerControl().add_to(m)
+
+        return m.get_root().render()
+
+    def render_map_html(placeholder, map_html):
+        with placeholder.container():
+            components.html(map_html, width=900, height=600)
 
     # Mostrar mapa
     col_map1, col_map2 = st.columns([3, 1])
 
     with col_map1:
-        st_folium(m, width=900, height=600, returned_objects=[])
-        
-        st.caption("""
-        **Interpretación del mapa:**
-        - Los círculos representan la cantidad de visitantes (tamaño proporcional)
-        - El color indica la intensidad (verde = menor, rojo = mayor)
-        - Haz clic en cualquier marcador para ver detalles específicos
-        """)
+        if modo_mapa == "Coropletas":
+            choropleth_map(
+                zoom_mapa,
+                valores,
+                opacidad,
+                caption=f'Visitantes por Departamento ({destino_sel} - {temporada_sel})',
+                key="mapa_coropletas"
+            )
+
+            st.caption("""
+            **Interpretación del mapa:**
+            - Cada departamento se colorea según sus visitantes (verde = menor, rojo = mayor)
+            - Los departamentos en gris no tienen datos para esta combinación
+            - Pasa el cursor sobre un departamento para ver el detalle
+            """)
+        else:
+            renderer.add(
+                lambda: cached(
+                    "map", (version, "puntos", destino_sel, temporada_sel, escala_marcadores, opacidad),
+                    build_map_html
+                ),
+                render_map_html,
+                height=600
+            )
+
+            st.caption("""
+            **Interpretación del mapa:**
+            - Los círculos representan la cantidad de visitantes (tamaño proporcional)
+            - El color indica la intensidad (verde = menor, rojo = mayor)
+            - Haz clic en cualquier marcador para ver detalles específicos
+            """)
 
     with col_map2:
         st.markdown("### 📋 Datos del Mapa")
@@ -254,8 +353,9 @@ else:
         if not data_filtrado.empty:
             tabla_resumen = data_filtrado[['Departamento', 'Visitantes']].sort_values('Visitantes', ascending=False)
             tabla_resumen['Visitantes'] = tabla_resumen['Visitantes'].apply(lambda x: f"{x:,.0f}")
-            st.dataframe(
+            paged_dataframe(
                 tabla_resumen,
+                key="mapa_tabla_pagina",
                 use_container_width=True,
                 hide_index=True,
                 height=400
@@ -277,35 +377,53 @@ if not data_filtrado.empty:
     col_anal1, col_anal2 = st.columns(2)
     
     with col_anal1:
-        # Gráfico de barras horizontal
-        fig_barras = px.bar(
-            data_filtrado.sort_values('Visitantes', ascending=True),
-            y='Departamento',
-            x='Visitantes',
-            title=f"Visitantes por Departamento - {destino_sel} ({temporada_sel})",
-            orientation='h',
-            color='Visitantes',
-            color_continuous_scale='viridis'
+        # Gráfico de barras horizontal (Top-K + Otros en modo LOD)
+        def build_fig_barras():
+            data_barras = top_k_with_others(data_filtrado, 'Departamento', 'Visitantes', top_k) if top_k else data_filtrado
+            fig_barras = px.bar(
+                data_barras.sort_values('Visitantes', ascending=True),
+                y='Departamento',
+                x='Visitantes',
+                title=f"Visitantes por Departamento - {destino_sel} ({temporada_sel})",
+                orientation='h',
+                color='Visitantes',
+                color_continuous_scale='viridis'
+            )
+            fig_barras.update_layout(height=400)
+            return fig_barras
+
+        renderer.add(
+            lambda: cached("figure", (version, "mapa_barras", destino_sel, temporada_sel, top_k), build_fig_barras),
+            render_plotly
         )
-        fig_barras.update_layout(height=400)
-        st.plotly_chart(fig_barras, use_container_width=True)
     
     with col_anal2:
         # Mapa de calor de densidad
-        fig_densidad = px.density_mapbox(
-            data_filtrado,
-            lat='Latitud',
-            lon='Longitud',
-            z='Visitantes',
-            radius=30,
-            center=dict(lat=4.6097, lon=-74.0818),
-            zoom=4,
-            mapbox_style="open-street-map",
-            title=f"Densidad de Visitantes - {destino_sel} ({temporada_sel})",
-            hover_data=['Departamento']
+        def build_fig_densidad():
+            # plotly >= 5.24 reemplaza density_mapbox por density_map (MapLibre) y 6.x retira el primero
+            if hasattr(px, "density_map"):
+                density, estilo = px.density_map, {"map_style": "open-street-map"}
+            else:
+                density, estilo = px.density_mapbox, {"mapbox_style": "open-street-map"}
+            fig_densidad = density(
+                data_filtrado,
+                lat='Latitud',
+                lon='Longitud',
+                z='Visitantes',
+                radius=30,
+                center=dict(lat=4.6097, lon=-74.0818),
+                zoom=4,
+                title=f"Densidad de Visitantes - {destino_sel} ({temporada_sel})",
+                hover_data=['Departamento'],
+                **estilo
+            )
+            fig_densidad.update_layout(height=400)
+            return fig_densidad
+
+        renderer.add(
+            lambda: cached("figure", (version, "mapa_densidad", destino_sel, temporada_sel), build_fig_densidad),
+            render_plotly
         )
-        fig_densidad.update_layout(height=400)
-        st.plotly_chart(fig_densidad, use_container_width=True)
 
 # Footer
 st.markdown("---")
@@ -314,4 +432,7 @@ st.markdown(
     "Mapa interactivo desarrollado con Streamlit y Folium • Datos: Turismo Nacional Colombia"
     "</div>", 
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+# Rellenar los placeholders del mapa y los gráficos pesados
+renderer.run()
@@ -0,0 +1,180 @@
+import hmac
+import os
+
+import streamlit as st
+import pandas as pd
+from utils.cache import DEFAULT_TTLS, get_cache_manager
+from utils.data import DATA_PATH, load_ingest
+
+# Configuración de página DEBE ir al principio
+st.set_page_config(
+    page_title="Administración de Caché - Turismo Colombia", 
+    layout="wide", 
+    initial_sidebar_state="expanded"
+)
+
+# Ocultar sidebar nav nativo de Streamlit
+st.markdown("""
+<style>
+    [data-testid="stSidebarNav"] {
+        display: none;
+    }
+    
+    .section-header {
+        color: #1f77b4;
+        border-bottom: 2px solid #1f77b4;
+        padding-bottom: 0.5rem;
+        margin: 2rem 0 1rem 0;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# Página de administración: no aparece en el menú principal
+with st.sidebar:
+    st.title("🧰 Administración")
+    st.markdown("---")
+    st.page_link("pages/1_Inicio.py", label="Volver al inicio", icon="🏠")
+
+cache = get_cache_manager()
+
+# Header principal
+st.title("🧰 Administración de Caché")
+st.markdown("Estado de los datos, agregados, figuras y mapas cacheados en este proceso")
+
+# ========== SECCIÓN 1: USO DE MEMORIA ==========
+st.markdown('<h3 class="section-header">💾 Uso de Memoria</h3>', unsafe_allow_html=True)
+
+cache.purge_expired()
+entries = cache.entries()
+
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.metric("Presupuesto", f"{cache.max_bytes / 1024 ** 2:,.1f} MB")
+
+with col2:
+    st.metric(
+        "En uso", 
+        f"{cache.used_bytes / 1024 ** 2:,.2f} MB",
+        f"{cache.used_bytes / cache.max_bytes:.1%} del presupuesto"
+    )
+
+with col3:
+    st.metric("Entradas", len(entries))
+
+with col4:
+    st.metric(
+        "Cálculos en curso", 
+        cache.in_flight,
+        "Peticiones idénticas esperan al mismo cálculo",
+        delta_color="off"
+    )
+
+st.progress(min(1.0, cache.used_bytes / cache.max_bytes))
+
+# ========== SECCIÓN 2: ESTADÍSTICAS POR TIPO ==========
+st.markdown('<h3 class="section-header">📊 Estadísticas por Tipo</h3>', unsafe_allow_html=True)
+
+stats = pd.DataFrame(cache.stats())
+if stats.empty:
+    st.info("La caché aún no ha recibido consultas.")
+else:
+    st.dataframe(
+        stats,
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Tasa de acierto": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0, format="percent")}
+    )
+
+# ========== SECCIÓN 3: ENTRADAS ==========
+st.markdown('<h3 class="section-header">🗂️ Entradas (de menos a más reciente)</h3>', unsafe_allow_html=True)
+
+if entries:
+    st.dataframe(pd.DataFrame(entries), use_container_width=True, hide_index=True)
+else:
+    st.info("No hay entradas en caché.")
+
+# ========== SECCIÓN 4: VACIADO ==========
+st.markdown('<h3 class="section-header">🧹 Vaciar Caché</h3>', unsafe_allow_html=True)
+
+
+def admin_token():
+    # Variable de entorno (Render) o st.secrets["cache_admin_token"] (local)
+    token = os.environ.get("CACHE_ADMIN_TOKEN")
+    if token:
+        return token
+    try:
+        return st.secrets.get("cache_admin_token")
+    except Exception:
+        return None
+
+
+token_esperado = admin_token()
+if not token_esperado:
+    st.info("🔒 Vaciado deshabilitado: define CACHE_ADMIN_TOKEN para habilitar los controles de administración.")
+else:
+    token = st.text_input("Token de administración", type="password", key="cache_admin_token")
+    autorizado = bool(token) and hmac.compare_digest(token.encode(), token_esperado.encode())
+
+    if token and not autorizado:
+        st.error("Token incorrecto")
+
+    if autorizado:
+        col_flush1, col_flush2, col_flush3 = st.columns(3)
+
+        with col_flush1:
+            tipo_sel = st.selectbox("Tipo de artefacto", list(DEFAULT_TTLS))
+            if st.button(f"Vaciar '{tipo_sel}'"):
+                cache.invalidate(kind=tipo_sel)
+                st.rerun()
+
+        with col_flush2:
+            st.write("")
+            st.write("")
+            if st.button("Vaciar todo", type="primary"):
+                cache.invalidate()
+                st.rerun()
+
+        with col_flush3:
+            st.write("")
+            st.write("")
+            if st.button("Reiniciar estadísticas"):
+                cache.reset_stats()
+                st.rerun()
+
+# ========== SECCIÓN 5: VALIDACIÓN DE DATOS ==========
+st.markdown('<h3 class="section-header">✅ Validación de Datos</h3>', unsafe_allow_html=True)
+
+ingesta = load_ingest()
+reporte = ingesta.report
+
+col_val1, col_val2, col_val3 = st.columns(3)
+
+with col_val1:
+    st.metric(
+        "Filas válidas", 
+        f"{reporte.filas_validas:,}",
+        f"{reporte.filas_validas - reporte.filas_leidas:,} descartadas",
+        delta_color="off"
+    )
+
+with col_val2:
+    st.metric("Departamentos con coordenadas", len(ingesta.coordinates))
+
+with col_val3:
+    st.metric(
+        "Memoria del dataset", 
+        f"{reporte.bytes_compactados / 1024:,.1f} KB",
+        f"{reporte.bytes_originales / 1024:,.1f} KB sin compactar",
+        delta_color="off"
+    )
+
+col_rep1, col_rep2 = st.columns([2, 1])
+
+with col_rep1:
+    st.caption(f"Reporte de ingesta de {DATA_PATH}")
+    st.dataframe(pd.DataFrame(reporte.as_rows()), use_container_width=True, hide_index=True)
+
+with col_rep2:
+    st.caption("Coordenadas normalizadas por Departamento")
+    st.dataframe(ingesta.coordinates, use_container_width=True, hide_index=True)
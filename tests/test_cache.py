@@ -0,0 +1,119 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cache import CacheManager, estimate_size
+from utils.coalesce import SingleFlight
+
+
+def test_lru_eviction_respects_budget_and_recency():
+    cache = CacheManager(max_bytes=10, ttls={"figure": 60})
+    cache.put("figure", "a", "xxxx")
+    cache.put("figure", "b", "yyyy")
+    cache.get("figure", "a")  # "a" pasa a ser la más reciente
+    cache.put("figure", "c", "zzzz")
+
+    assert [e["Clave"] for e in cache.entries()] == ["'a'", "'c'"]
+    assert cache.used_bytes == 8
+    assert cache.stats()[0]["Desalojos"] == 1
+
+
+def test_entry_larger_than_budget_is_not_stored():
+    cache = CacheManager(max_bytes=10, ttls={})
+    assert cache.put("figure", "grande", "x" * 11) == "x" * 11
+    assert cache.entries() == []
+    assert cache.used_bytes == 0
+
+
+def test_ttl_expiration_counts_and_frees_bytes():
+    cache = CacheManager(max_bytes=100, ttls={"map": 0.01})
+    cache.put("map", "k", "html")
+    time.sleep(0.02)
+
+    assert cache.get("map", "k") == (False, None)
+    stats = cache.stats()[0]
+    assert stats["Expiraciones"] == 1
+    assert stats["Fallos"] == 1
+    assert cache.used_bytes == 0
+
+
+def test_estimate_size_walks_containers_without_pickling(monkeypatch):
+    import pickle
+
+    def no_pickle(*args, **kwargs):
+        raise AssertionError("estimate_size no debe serializar")
+
+    monkeypatch.setattr(pickle, "dumps", no_pickle)
+    df = pd.DataFrame({"x": np.arange(1000, dtype="int64")})
+    array = np.zeros(500)
+    value = {"df": df, "array": array, "alias": df}
+
+    size = estimate_size(value)
+    # El mismo objeto referenciado dos veces se cuenta una sola vez
+    assert df.memory_usage(deep=True).sum() + array.nbytes <= size < 2 * df.memory_usage(deep=True).sum()
+
+
+def test_concurrent_get_or_compute_runs_compute_once():
+    cache = CacheManager(max_bytes=10 ** 6, ttls={})
+    n_threads = 16
+    calls = []
+    barrier = threading.Barrier(n_threads)
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)  # tiempo para que el resto llegue mientras está en curso
+        return "valor"
+
+    def worker():
+        barrier.wait()
+        results.append(cache.get_or_compute("figure", ("v1", "barras"), compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ["valor"] * n_threads
+    stats = cache.stats()[0]
+    assert stats["Fallos"] == n_threads
+    assert stats["Coalescidas"] == n_threads - 1
+    assert cache.in_flight == 0
+
+
+def test_single_flight_shares_leader_error():
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def boom():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("fallo")
+
+    def leader():
+        with pytest.raises(ValueError):
+            flight.do("k", boom)
+
+    def waiter():
+        started.wait()
+        try:
+            flight.do("k", lambda: "no debería ejecutarse")
+        except ValueError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=leader)] + [threading.Thread(target=waiter) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 3
+    assert flight.in_flight == 0
+    # Tras el error la clave queda libre para un nuevo intento
+    assert flight.do("k", lambda: 1) == (1, False)
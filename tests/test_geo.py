@@ -0,0 +1,51 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils import geo
+
+
+def circle(lat, lon, n=60):
+    ring = [[lon + 0.5 * math.cos(2 * math.pi * t / n), lat + 0.5 * math.sin(2 * math.pi * t / n)] for t in range(n)]
+    return ring + [ring[0]]
+
+
+def test_simplify_ring_drops_collinear_points_and_keeps_closure():
+    ring = [[0, 0], [1, 0.001], [2, 0], [2, 2], [0, 2], [0, 0]]
+    simplified = geo._simplify_ring(ring, tolerance=0.01)
+    assert simplified.tolist() == [[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]
+
+
+def test_simplify_ring_coarser_tolerance_keeps_fewer_points():
+    ring = circle(6.0, -75.0)
+    fino = geo._simplify_ring(ring, 0.002)
+    grueso = geo._simplify_ring(ring, 0.05)
+    assert 4 <= len(grueso) < len(fino) <= len(ring)
+    assert (grueso[0] == grueso[-1]).all()
+
+
+def test_normalize_name_handles_accents_punctuation_and_aliases():
+    assert geo.normalize_name("Bogotá D.C.") == geo.normalize_name("BOGOTA, D.C.") == "BOGOTA DC"
+    assert geo.normalize_name("SANTAFE DE BOGOTA D.C") == "BOGOTA DC"
+    assert geo.normalize_name(" Nariño ") == "NARINO"
+
+
+def test_join_index_and_values(tmp_path, monkeypatch):
+    features = [
+        {"type": "Feature", "properties": {"NOMBRE_DPT": nombre}, "geometry": {"type": "Polygon", "coordinates": [circle(lat, lon)]}}
+        for nombre, lat, lon in [("ANTIOQUIA", 6.2, -75.5), ("BOGOTA, D.C.", 4.6, -74.0), ("AMAZONAS", -1.0, -71.9)]
+    ]
+    path = tmp_path / "departamentos.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    # Sin sesión de Streamlit: calcular directamente en lugar de usar la caché global
+    monkeypatch.setattr(geo, "cached", lambda kind, key, compute: compute())
+
+    indice = geo.get_join_index(["Antioquia", "Bogotá D.C.", "Nariño"], path=str(path))
+    assert indice == {"Antioquia": 0, "Bogotá D.C.": 1}
+
+    df = pd.DataFrame({"Departamento": ["Antioquia", "Antioquia", "Nariño"], "Visitantes": [10, 5, 7]})
+    valores = geo.choropleth_values(df, indice, len(features))
+    assert valores[0] == 15
+    assert np.isnan(valores[1:]).all()
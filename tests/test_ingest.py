@@ -0,0 +1,56 @@
+import io
+
+import pandas as pd
+import pytest
+
+from utils.ingest import ingest
+
+CSV = """ID,Departamento,Latitud,Longitud,Destino,Visitantes,Temporada
+1,Santander,7.1254,-73.1198,Montaña,7389,Baja
+1,Santander,7.1254,-73.1198,Montaña,7389,Baja
+2, Santander ,7.2000,-73.1198,Playa,15,Media
+3,Antioquia,6.2442,-75.5812,Montaña,abc,Media
+4,Antioquia,6.2442,-75.5812,Playa,-3,Alta
+5,Antioquia,60.2442,-75.5812,Playa,30,Alta
+6,Antioquia,6.2442,-75.5812,Selva,40,Alta
+7,Santander,7.1254,-73.1198,Selva,40,Alta
+8,  ,6.2442,-75.5812,Selva,40,Alta
+"""
+
+
+def test_validation_counts():
+    result = ingest(pd.read_csv(io.StringIO(CSV), dtype=str))
+    report = result.report
+
+    assert report.filas_leidas == 9
+    assert report.filas_validas == 4
+    assert report.valores_invalidos == {"Departamento": 1, "Visitantes": 1}
+    assert report.coordenadas_fuera_de_rango == 1
+    assert report.visitantes_negativos == 1
+    assert report.ids_duplicados == 1
+    assert report.coordenadas_inconsistentes == {"Santander": 1}
+    assert list(result.data["ID"]) == [1, 2, 6, 7]
+
+
+def test_output_is_compact_and_coordinates_normalized():
+    result = ingest(pd.read_csv(io.StringIO(CSV)))
+
+    assert "Latitud" not in result.data.columns
+    assert result.data["Departamento"].dtype == "category"
+    assert result.data["Departamento"].astype(str).str.strip().eq(result.data["Departamento"].astype(str)).all()
+    coords = result.coordinates.set_index("Departamento")
+    assert coords.loc["Santander", "Latitud"] == pytest.approx(7.1254)
+
+
+def test_coordinate_tie_keeps_first_occurrence():
+    csv = """ID,Departamento,Latitud,Longitud,Destino,Visitantes,Temporada
+1,Santander,7.2,-73.1,Montaña,1,Baja
+2,Santander,7.1,-73.1,Playa,1,Baja
+"""
+    result = ingest(pd.read_csv(io.StringIO(csv)))
+    assert result.coordinates.loc[0, "Latitud"] == pytest.approx(7.2)
+
+
+def test_missing_columns_raise():
+    with pytest.raises(ValueError, match="Visitantes"):
+        ingest(pd.DataFrame({"ID": [1], "Departamento": ["Antioquia"]}))
@@ -0,0 +1,41 @@
+import pandas as pd
+
+from utils.lod import lump_others, page_slice, top_k_with_others
+
+
+def test_top_k_keeps_largest_and_sums_rest():
+    df = pd.DataFrame({
+        "Destino": list("abcdef"),
+        "Visitantes": [1, 5, 3, 2, 8, 4],
+        "Departamento": ["Antioquia"] * 6,
+    })
+
+    result = top_k_with_others(df, "Destino", "Visitantes", k=3)
+
+    assert list(result["Destino"]) == ["e", "b", "f", "Otros (3)"]
+    assert list(result["Visitantes"]) == [8, 5, 4, 6]
+    assert result["Visitantes"].sum() == df["Visitantes"].sum()
+    assert result.iloc[-1]["Departamento"] == "Antioquia"
+
+
+def test_top_k_without_overflow_is_unchanged():
+    df = pd.DataFrame({"Destino": ["a", "b"], "Visitantes": [1, 2]})
+    assert top_k_with_others(df, "Destino", "Visitantes", k=5) is df
+
+
+def test_lump_others_relabels_rows_outside_top_k():
+    df = pd.DataFrame({
+        "Destino": pd.Categorical(list("aabbccd")),
+        "Visitantes": [5, 5, 1, 1, 7, 0, 2],
+    })
+
+    result = lump_others(df, "Destino", "Visitantes", k=2)
+
+    assert list(result["Destino"]) == ["a", "a", "Otros (2)", "Otros (2)", "c", "c", "Otros (2)"]
+    assert result["Visitantes"].equals(df["Visitantes"])
+    assert lump_others(df, "Destino", "Visitantes", k=4) is df
+
+
+def test_page_slice():
+    df = pd.DataFrame({"x": range(60)})
+    assert list(page_slice(df, 3, 25)["x"]) == list(range(50, 60))
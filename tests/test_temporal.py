@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.temporal import GRANULARIDADES, build_rollups, has_dates
+
+
+@pytest.fixture
+def dated():
+    rng = np.random.default_rng(0)
+    n = 5000
+    return pd.DataFrame({
+        "Departamento": rng.choice(["Antioquia", "Nariño", "Santander"], n),
+        "Destino": rng.choice(["Playa", "Montaña"], n),
+        "Visitantes": rng.integers(0, 1000, n),
+        "Fecha": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 800, n), unit="D"),
+    })
+
+
+@pytest.mark.parametrize("granularidad", list(GRANULARIDADES))
+def test_range_totals_match_brute_force(dated, granularidad):
+    rollup = build_rollups(dated)[granularidad]
+    start, end = "2023-03-15", "2024-07-03"
+
+    got = rollup.range_totals(start, end).set_index(["Departamento", "Destino"])["Visitantes"]
+
+    # Los periodos de los extremos se cuentan completos
+    periodo_ini = pd.Period(start, freq=rollup.freq)
+    periodo_fin = pd.Period(end, freq=rollup.freq)
+    mask = dated["Fecha"].between(periodo_ini.start_time, periodo_fin.end_time)
+    expected = dated[mask].groupby(["Departamento", "Destino"])["Visitantes"].sum()
+
+    pd.testing.assert_series_equal(got.sort_index(), expected.sort_index(), check_names=False, check_dtype=False)
+
+
+def test_series_sums_to_range_total(dated):
+    rollups = build_rollups(dated)
+    serie = rollups["Mes"].series("2023-02-01", "2023-11-30")
+    total = rollups["Mes"].range_totals("2023-02-01", "2023-11-30")["Visitantes"].sum()
+
+    assert len(serie) == 10
+    assert serie["Visitantes"].sum() == total
+
+
+def test_range_outside_data_is_empty(dated):
+    rollup = build_rollups(dated)["Día"]
+    assert rollup.range_totals("2030-01-01", "2030-12-31")["Visitantes"].sum() == 0
+    assert rollup.series("2010-01-01", "2010-02-01").empty
+
+
+def test_all_invalid_dates_have_no_rollups():
+    df = pd.DataFrame({
+        "Departamento": ["Antioquia"],
+        "Destino": ["Playa"],
+        "Visitantes": [10],
+        "Fecha": [pd.NaT],
+    })
+    assert not has_dates(df)
+    assert build_rollups(df) is None
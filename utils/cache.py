@@ -0,0 +1,304 @@
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields, is_dataclass
+
+import pandas as pd
+
+from utils.coalesce import SingleFlight
+
+# Presupuesto global de memoria (MB) y TTL (segundos) por tipo de artefacto.
+# Se pueden sobreescribir con CACHE_MAX_MB y CACHE_TTL_<TIPO> (p. ej. CACHE_TTL_FIGURE=600).
+DEFAULT_MAX_MB = 128
+DEFAULT_TTLS = {
+    "dataset": 3600,
+    "aggregate": 1800,
+    "figure": 900,
+    "map": 900,
+    "geometry": 86400,
+}
+
+# Instantánea de la caché generada al construir la imagen (ver utils/warmup.py)
+SNAPSHOT_PATH = os.environ.get("CACHE_SNAPSHOT", "data/processed/cache_snapshot.pkl")
+
+
+def estimate_size(value, _seen=None):
+    """Tamaño aproximado en bytes de un artefacto cacheado.
+
+    Recorre contenedores y dataclasses sumando lo que mide cada parte, sin
+    serializar el artefacto completo (eso duplicaría en memoria el dataset).
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if hasattr(value, "nbytes"):
+        # Arrays de numpy y TemporalRollup
+        return int(value.nbytes)
+    if hasattr(value, "to_plotly_json"):
+        # Figuras de plotly: dict de listas/arrays, acotado por el modo LOD
+        return estimate_size(value.to_dict(), _seen)
+    if is_dataclass(value):
+        return sys.getsizeof(value) + sum(
+            estimate_size(getattr(value, f.name), _seen) for f in fields(value)
+        )
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item, _seen) for item in value)
+    # Escalares y objetos pequeños
+    return sys.getsizeof(value)
+
+
+@dataclass
+class CacheEntry:
+    kind: str
+    key: tuple
+    value: object
+    size: int
+    created: float
+    expires: float
+    last_access: float = 0.0
+    hits: int = 0
+
+
+@dataclass
+class KindStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+@dataclass
+class CacheManager:
+    """Caché LRU compartida entre sesiones con presupuesto de memoria y TTL por tipo.
+
+    Los fallos concurrentes sobre la misma clave se resuelven con un solo
+    cálculo (single-flight); los demás hilos esperan su resultado.
+    """
+
+    max_bytes: int
+    ttls: dict
+    _entries: OrderedDict = field(default_factory=OrderedDict, repr=False)
+    _stats: dict = field(default_factory=dict, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    _flight: SingleFlight = field(default_factory=SingleFlight, repr=False)
+    used_bytes: int = 0
+
+    def _kind_stats(self, kind):
+        return self._stats.setdefault(kind, KindStats())
+
+    def _remove(self, full_key):
+        entry = self._entries.pop(full_key)
+        self.used_bytes -= entry.size
+        return entry
+
+    def _evict_until_fits(self, size):
+        while self._entries and self.used_bytes + size > self.max_bytes:
+            # OrderedDict mantiene el orden de uso: el primero es el menos reciente
+            full_key = next(iter(self._entries))
+            entry = self._remove(full_key)
+            self._kind_stats(entry.kind).evictions += 1
+
+    def get(self, kind, key):
+        """Devuelve (encontrado, valor) y actualiza estadísticas y orden LRU."""
+        full_key = (kind, key)
+        now = time.time()
+        with self._lock:
+            stats = self._kind_stats(kind)
+            entry = self._entries.get(full_key)
+            if entry is not None and entry.expires <= now:
+                self._remove(full_key)
+                stats.expirations += 1
+                entry = None
+            if entry is None:
+                stats.misses += 1
+                return False, None
+            self._entries.move_to_end(full_key)
+            entry.last_access = now
+            entry.hits += 1
+            stats.hits += 1
+            return True, entry.value
+
+    def put(self, kind, key, value):
+        full_key = (kind, key)
+        size = estimate_size(value)
+        now = time.time()
+        with self._lock:
+            if full_key in self._entries:
+                self._remove(full_key)
+            # Un artefacto mayor que todo el presupuesto no se guarda
+            if size > self.max_bytes:
+                return value
+            self._evict_until_fits(size)
+            ttl = self.ttls.get(kind, DEFAULT_TTLS["aggregate"])
+            self._entries[full_key] = CacheEntry(
+                kind=kind,
+                key=key,
+                value=value,
+                size=size,
+                created=now,
+                expires=now + ttl,
+                last_access=now,
+            )
+            self.used_bytes += size
+        return value
+
+    def _peek(self, kind, key):
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is None or entry.expires <= time.time():
+                return False, None
+            return True, entry.value
+
+    def get_or_compute(self, kind, key, compute):
+        found, value = self.get(kind, key)
+        if found:
+            return value
+
+        def compute_and_store():
+            # Otro hilo pudo terminar el mismo cálculo justo antes de que este tomara el turno
+            found, value = self._peek(kind, key)
+            return value if found else self.put(kind, key, compute())
+
+        value, shared = self._flight.do((kind, key), compute_and_store)
+        if shared:
+            with self._lock:
+                self._kind_stats(kind).coalesced += 1
+        return value
+
+    @property
+    def in_flight(self):
+        return self._flight.in_flight
+
+    def invalidate(self, kind=None, key=None):
+        """Elimina entradas por tipo, por clave o todas. Devuelve cuántas se eliminaron."""
+        with self._lock:
+            targets = [
+                full_key for full_key in self._entries
+                if (kind is None or full_key[0] == kind) and (key is None or full_key[1] == key)
+            ]
+            for full_key in targets:
+                self._remove(full_key)
+            return len(targets)
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [k for k, e in self._entries.items() if e.expires <= now]
+            for full_key in expired:
+                entry = self._remove(full_key)
+                self._kind_stats(entry.kind).expirations += 1
+            return len(expired)
+
+    def stats(self):
+        """Resumen por tipo de artefacto: entradas, bytes y contadores."""
+        with self._lock:
+            kinds = set(self._stats) | {e.kind for e in self._entries.values()}
+            rows = []
+            for kind in sorted(kinds):
+                stats = self._kind_stats(kind)
+                entries = [e for e in self._entries.values() if e.kind == kind]
+                lookups = stats.hits + stats.misses
+                rows.append({
+                    "Tipo": kind,
+                    "Entradas": len(entries),
+                    "Bytes": sum(e.size for e in entries),
+                    "TTL (s)": self.ttls.get(kind, DEFAULT_TTLS["aggregate"]),
+                    "Aciertos": stats.hits,
+                    "Fallos": stats.misses,
+                    "Coalescidas": stats.coalesced,
+                    "Tasa de acierto": stats.hits / lookups if lookups else 0.0,
+                    "Desalojos": stats.evictions,
+                    "Expiraciones": stats.expirations,
+                })
+            return rows
+
+    def entries(self):
+        """Entradas actuales, de la más antigua a la más reciente en orden LRU."""
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "Tipo": e.kind,
+                    "Clave": repr(e.key),
+                    "Bytes": e.size,
+                    "Aciertos": e.hits,
+                    "Edad (s)": round(now - e.created, 1),
+                    "Expira en (s)": round(max(0.0, e.expires - now), 1),
+                }
+                for e in self._entries.values()
+            ]
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    def save_snapshot(self, path, kinds):
+        """Guarda en disco las entradas de los tipos indicados."""
+        with self._lock:
+            items = [(e.kind, e.key, e.value) for e in self._entries.values() if e.kind in kinds]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return len(items)
+
+    def load_snapshot(self, path):
+        """Carga una instantánea generada por `save_snapshot`; el TTL empieza al cargarla."""
+        if not os.path.exists(path):
+            return 0
+        with open(path, "rb") as f:
+            items = pickle.load(f)
+        for kind, key, value in items:
+            self.put(kind, key, value)
+        return len(items)
+
+
+def _ttls_from_env():
+    ttls = dict(DEFAULT_TTLS)
+    for kind in DEFAULT_TTLS:
+        env_value = os.environ.get(f"CACHE_TTL_{kind.upper()}")
+        if env_value:
+            ttls[kind] = float(env_value)
+    return ttls
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_cache_manager():
+    """Caché única del proceso, compartida por todas las sesiones.
+
+    Es un singleton de módulo (no `st.cache_resource`) para poder precargarla
+    antes de arrancar el servidor (ver utils/serve.py).
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            max_mb = float(os.environ.get("CACHE_MAX_MB", DEFAULT_MAX_MB))
+            _manager = CacheManager(max_bytes=int(max_mb * 1024 * 1024), ttls=_ttls_from_env())
+            _manager.load_snapshot(SNAPSHOT_PATH)
+        return _manager
+
+
+def cached(kind, key, compute):
+    """Atajo para `get_cache_manager().get_or_compute(...)`."""
+    return get_cache_manager().get_or_compute(kind, key, compute)
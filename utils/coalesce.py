@@ -0,0 +1,51 @@
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: object = None
+    error: BaseException = None
+
+
+class SingleFlight:
+    """Agrupa cálculos concurrentes con la misma clave en una sola ejecución.
+
+    El primer hilo que llega ejecuta la función; los que llegan mientras
+    tanto esperan y reciben el mismo resultado (o la misma excepción).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Devuelve (valor, compartido); `compartido` es True si se esperó a otro hilo."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    @property
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,36 @@
+import os
+
+import pandas as pd
+
+from utils.cache import cached
+from utils.ingest import ingest, read_outputs
+
+DATA_PATH = "data/turismo_nacional.csv"
+# Salida de `python -m utils.ingest` (Parquet), generada al construir la imagen
+PROCESSED_DIR = "data/processed"
+
+
+def data_version(path=DATA_PATH):
+    """Identificador de versión del archivo de datos (cambia al modificarse)."""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _read_ingest(version):
+    # Si hay una salida en Parquet del mismo CSV se evita parsear y validar de nuevo
+    processed = read_outputs(PROCESSED_DIR, version)
+    return processed if processed is not None else ingest(pd.read_csv(DATA_PATH))
+
+
+def load_ingest():
+    """Dataset validado y compactado, tabla de coordenadas y reporte de validación."""
+    version = data_version()
+    return cached("dataset", (DATA_PATH, version), lambda: _read_ingest(version))
+
+
+def load_data():
+    return load_ingest().data
+
+
+def load_coordinates():
+    return load_ingest().coordinates
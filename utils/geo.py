@@ -0,0 +1,174 @@
+import json
+import os
+import re
+import unicodedata
+
+import numpy as np
+import streamlit as st
+import streamlit.components.v1 as components
+
+from utils.cache import cached
+from utils.data import data_version
+
+# Geometría de departamentos para el modo de coropletas. El archivo no se
+# distribuye con la app: basta con copiar cualquier GeoJSON de departamentos
+# de Colombia (p. ej. el del Marco Geoestadístico del DANE) en esta ruta.
+GEOJSON_PATH = "data/colombia_departamentos.geojson"
+
+# Propiedades habituales con el nombre del departamento en los GeoJSON públicos
+NAME_PROPERTIES = ("NOMBRE_DPT", "DPTO_CNMBR", "DPTO_NOMBRE", "NAME_1", "nombre", "name", "Departamento")
+
+# Tolerancia de simplificación (grados) según el nivel de zoom del mapa
+ZOOM_TOLERANCES = {
+    5: 0.05,
+    6: 0.02,
+    7: 0.01,
+    8: 0.005,
+    9: 0.002,
+}
+
+# Componente Leaflet propio (utils/frontend/coropletas): conserva la geometría
+# en el navegador y solo recibe valores nuevos en cada rerun
+_coropletas = components.declare_component(
+    "coropletas",
+    path=os.path.join(os.path.dirname(__file__), "frontend", "coropletas")
+)
+
+# Variantes de nombres ya normalizadas -> nombre canónico normalizado
+ALIASES = {
+    "BOGOTA": "BOGOTA DC",
+    "SANTAFE DE BOGOTA DC": "BOGOTA DC",
+    "SANTA FE DE BOGOTA DC": "BOGOTA DC",
+    "ARCHIPIELAGO DE SAN ANDRES PROVIDENCIA Y SANTA CATALINA": "SAN ANDRES",
+    "SAN ANDRES PROVIDENCIA Y SANTA CATALINA": "SAN ANDRES",
+    "SAN ANDRES Y PROVIDENCIA": "SAN ANDRES",
+    "VALLE": "VALLE DEL CAUCA",
+}
+
+
+def normalize_name(name):
+    """Nombre comparable: sin tildes, en mayúsculas y sin puntuación."""
+    name = unicodedata.normalize("NFKD", str(name))
+    name = "".join(c for c in name if not unicodedata.combining(c)).upper().replace(".", "")
+    name = re.sub(r"[^A-Z0-9]+", " ", name).strip()
+    return ALIASES.get(name, name)
+
+
+def geojson_available(path=GEOJSON_PATH):
+    return os.path.exists(path)
+
+
+def _feature_name(feature):
+    properties = feature.get("properties") or {}
+    for prop in NAME_PROPERTIES:
+        if properties.get(prop):
+            return str(properties[prop])
+    return ""
+
+
+def _simplify_ring(ring, tolerance):
+    """Douglas-Peucker sobre un anillo; conserva el original si quedaría degenerado."""
+    points = np.asarray(ring, dtype=float)[:, :2]
+    if len(points) <= 4:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        segment = points[j] - points[i]
+        relative = points[i + 1:j] - points[i]
+        length = np.hypot(segment[0], segment[1])
+        if length == 0:
+            distances = np.hypot(relative[:, 0], relative[:, 1])
+        else:
+            distances = np.abs(segment[0] * relative[:, 1] - segment[1] * relative[:, 0]) / length
+        k = int(np.argmax(distances))
+        if distances[k] > tolerance:
+            keep[i + 1 + k] = True
+            stack.extend([(i, i + 1 + k), (i + 1 + k, j)])
+    simplified = points[keep]
+    return simplified if len(simplified) >= 4 else points
+
+
+def _simplify_geometry(geometry, tolerance):
+    def polygon(rings):
+        return [np.round(_simplify_ring(ring, tolerance), 5).tolist() for ring in rings]
+
+    if geometry["type"] == "Polygon":
+        return {"type": "Polygon", "coordinates": polygon(geometry["coordinates"])}
+    if geometry["type"] == "MultiPolygon":
+        return {"type": "MultiPolygon", "coordinates": [polygon(p) for p in geometry["coordinates"]]}
+    return geometry
+
+
+def _load_simplified(path, tolerance):
+    with open(path, encoding="utf-8") as f:
+        geojson = json.load(f)
+    # Solo se conserva el nombre: el resto de propiedades no se usa en el mapa
+    features = [
+        {
+            "type": "Feature",
+            "id": i,
+            "properties": {"Departamento": _feature_name(feature)},
+            "geometry": _simplify_geometry(feature["geometry"], tolerance),
+        }
+        for i, feature in enumerate(geojson["features"])
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+def get_geometry(zoom, path=GEOJSON_PATH):
+    """GeoJSON simplificado para el zoom dado, cacheado por versión del archivo."""
+    tolerance = ZOOM_TOLERANCES[zoom]
+    return cached("geometry", (path, data_version(path), tolerance), lambda: _load_simplified(path, tolerance))
+
+
+def get_join_index(departamentos, path=GEOJSON_PATH):
+    """Índice Departamento -> posición del polígono (solo los que tienen geometría)."""
+    departamentos = tuple(sorted(departamentos))
+
+    def build():
+        # La geometría más gruesa basta para leer los nombres
+        geometry = get_geometry(min(ZOOM_TOLERANCES), path)
+        by_name = {
+            normalize_name(f["properties"]["Departamento"]): f["id"]
+            for f in geometry["features"]
+        }
+        return {d: by_name[normalize_name(d)] for d in departamentos if normalize_name(d) in by_name}
+
+    return cached("geometry", (path, data_version(path), "indice", departamentos), build)
+
+
+def choropleth_values(df, join_index, n_features):
+    """Array de Visitantes alineado con los polígonos (NaN donde no hay datos)."""
+    values = np.full(n_features, np.nan)
+    totals = df.groupby("Departamento", observed=True)["Visitantes"].sum()
+    for departamento, visitantes in totals.items():
+        if departamento in join_index:
+            values[join_index[departamento]] = visitantes
+    return values
+
+
+def choropleth_map(zoom, valores, opacity, caption, key, height=600, path=GEOJSON_PATH):
+    """Dibuja el mapa de coropletas.
+
+    La geometría solo se envía cuando el navegador aún no la tiene (primera
+    carga, cambio de zoom o iframe recreado); el componente devuelve el id de
+    la geometría que conserva y en los demás reruns viaja solo `valores`.
+    """
+    geometry_id = f"{data_version(path)}-{ZOOM_TOLERANCES[zoom]}"
+    en_navegador = st.session_state.get(key)
+    return _coropletas(
+        geometry_id=geometry_id,
+        geometry=None if en_navegador == geometry_id else get_geometry(zoom, path),
+        values=[None if np.isnan(v) else float(v) for v in valores],
+        opacity=opacity,
+        zoom=zoom,
+        caption=caption,
+        height=height,
+        key=key,
+        default=None
+    )
@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from utils.temporal import DATE_COLUMN
+
+# Etapa de ingesta: valida el CSV de forma vectorizada, deduplica por ID,
+# normaliza las coordenadas a una tabla por Departamento y compacta tipos.
+REQUIRED_COLUMNS = ["ID", "Departamento", "Latitud", "Longitud", "Destino", "Visitantes", "Temporada"]
+NUMERIC_COLUMNS = ["ID", "Latitud", "Longitud", "Visitantes"]
+CATEGORY_COLUMNS = ["Departamento", "Destino", "Temporada"]
+COORD_COLUMNS = ["Latitud", "Longitud"]
+
+REPORT_LABELS = {
+    "filas_leidas": "Filas leídas",
+    "filas_validas": "Filas válidas",
+    "valores_texto_convertidos": "Números leídos como texto",
+    "valores_invalidos": "Valores faltantes o no numéricos",
+    "coordenadas_fuera_de_rango": "Coordenadas fuera de Colombia",
+    "visitantes_negativos": "Visitantes negativos",
+    "ids_duplicados": "IDs duplicados eliminados",
+    "coordenadas_inconsistentes": "Filas con coordenadas distintas a las del departamento",
+    "fechas_invalidas": "Fechas inválidas",
+    "bytes_originales": "Bytes originales",
+    "bytes_compactados": "Bytes compactados",
+}
+
+# Caja que contiene a Colombia (incluido San Andrés)
+LAT_RANGE = (-4.5, 13.6)
+LON_RANGE = (-82.0, -66.8)
+
+
+@dataclass
+class IngestReport:
+    filas_leidas: int = 0
+    filas_validas: int = 0
+    valores_texto_convertidos: dict = field(default_factory=dict)
+    valores_invalidos: dict = field(default_factory=dict)
+    coordenadas_fuera_de_rango: int = 0
+    visitantes_negativos: int = 0
+    ids_duplicados: int = 0
+    coordenadas_inconsistentes: dict = field(default_factory=dict)
+    fechas_invalidas: int = 0
+    bytes_originales: int = 0
+    bytes_compactados: int = 0
+
+    def as_rows(self):
+        """Filas (Validación, Valor) para mostrar el reporte como tabla."""
+        rows = []
+        for nombre, valor in asdict(self).items():
+            if isinstance(valor, dict):
+                valor = ", ".join(f"{k}: {v}" for k, v in valor.items()) or "0"
+            rows.append({"Validación": REPORT_LABELS[nombre], "Valor": str(valor)})
+        return rows
+
+
+@dataclass
+class IngestResult:
+    data: pd.DataFrame
+    coordinates: pd.DataFrame
+    report: IngestReport
+
+
+def _coerce_numeric(df, report):
+    for column in NUMERIC_COLUMNS:
+        original = df[column]
+        if pd.api.types.is_numeric_dtype(original):
+            continue
+        texto = original.astype("string").str.strip()
+        converted = pd.to_numeric(texto, errors="coerce").astype("float64")
+        report.valores_texto_convertidos[column] = int((converted.notna() & original.notna()).sum())
+        df[column] = converted
+
+
+def _coordinates_table(df, report):
+    """Coordenada más frecuente por Departamento y número de filas que no coinciden.
+
+    En caso de empate gana la variante que aparece primero en el archivo.
+    """
+    counts = (
+        df.groupby(["Departamento", *COORD_COLUMNS], observed=True, sort=False)
+        .size()
+        .reset_index(name="n")
+    )
+    coordinates = (
+        counts.sort_values("n", ascending=False, kind="stable")
+        .drop_duplicates("Departamento")
+        .drop(columns="n")
+        .set_index("Departamento")
+        .sort_index()
+    )
+    joined = coordinates.reindex(df["Departamento"])
+    mismatched = ~np.isclose(joined[COORD_COLUMNS].to_numpy(), df[COORD_COLUMNS].to_numpy()).all(axis=1)
+    report.coordenadas_inconsistentes = (
+        df.loc[mismatched, "Departamento"].astype(str).value_counts().to_dict()
+    )
+    return coordinates.reset_index()
+
+
+def ingest(raw):
+    """Valida y compacta el dataset crudo. Lanza ValueError si faltan columnas."""
+    missing = [c for c in REQUIRED_COLUMNS if c not in raw.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas obligatorias: {', '.join(missing)}")
+
+    report = IngestReport(filas_leidas=len(raw), bytes_originales=int(raw.memory_usage(deep=True).sum()))
+    df = raw.copy()
+
+    for column in CATEGORY_COLUMNS:
+        # Un texto vacío cuenta como valor faltante
+        df[column] = df[column].astype("string").str.strip().replace("", pd.NA)
+    _coerce_numeric(df, report)
+
+    required_present = df[REQUIRED_COLUMNS].notna()
+    report.valores_invalidos = {
+        c: int(n) for c, n in (~required_present).sum().items() if n
+    }
+    fuera_de_rango = ~(
+        df["Latitud"].between(*LAT_RANGE) & df["Longitud"].between(*LON_RANGE)
+    ) & required_present[COORD_COLUMNS].all(axis=1)
+    negativos = df["Visitantes"] < 0
+    report.coordenadas_fuera_de_rango = int(fuera_de_rango.sum())
+    report.visitantes_negativos = int(negativos.sum())
+    df = df[required_present.all(axis=1) & ~fuera_de_rango & ~negativos]
+
+    duplicated = df["ID"].duplicated(keep="first")
+    report.ids_duplicados = int(duplicated.sum())
+    df = df[~duplicated]
+
+    if DATE_COLUMN in df.columns:
+        fechas = pd.to_datetime(df[DATE_COLUMN], errors="coerce")
+        report.fechas_invalidas = int((fechas.isna() & df[DATE_COLUMN].notna()).sum())
+        df = df.assign(**{DATE_COLUMN: fechas})
+
+    coordinates = _coordinates_table(df, report)
+
+    # Las coordenadas viven en la tabla por Departamento, no en cada fila
+    columns = [c for c in df.columns if c not in COORD_COLUMNS]
+    data = df[columns].astype({c: "category" for c in CATEGORY_COLUMNS})
+    data["ID"] = pd.to_numeric(data["ID"], downcast="integer")
+    data["Visitantes"] = pd.to_numeric(data["Visitantes"], downcast="integer")
+    data = data.reset_index(drop=True)
+
+    report.filas_validas = len(data)
+    report.bytes_compactados = int(
+        data.memory_usage(deep=True).sum() + coordinates.memory_usage(deep=True).sum()
+    )
+    return IngestResult(data=data, coordinates=coordinates, report=report)
+
+
+def write_outputs(result, out_dir, version):
+    """Escribe el dataset limpio y la tabla de coordenadas en Parquet, y el reporte en JSON.
+
+    `version` identifica el CSV de origen; `read_outputs` lo usa para no servir datos viejos.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    result.data.to_parquet(os.path.join(out_dir, "turismo.parquet"), index=False)
+    result.coordinates.to_parquet(os.path.join(out_dir, "coordenadas.parquet"), index=False)
+    with open(os.path.join(out_dir, "reporte.json"), "w", encoding="utf-8") as f:
+        json.dump({"version": version, **asdict(result.report)}, f, ensure_ascii=False, indent=2)
+
+
+def read_outputs(out_dir, version):
+    """Lee la salida de `write_outputs` si existe y corresponde a `version`; si no, None."""
+    report_path = os.path.join(out_dir, "reporte.json")
+    if not os.path.exists(report_path):
+        return None
+    with open(report_path, encoding="utf-8") as f:
+        report = json.load(f)
+    if report.pop("version", None) != version:
+        return None
+    return IngestResult(
+        data=pd.read_parquet(os.path.join(out_dir, "turismo.parquet")),
+        coordinates=pd.read_parquet(os.path.join(out_dir, "coordenadas.parquet")),
+        report=IngestReport(**report),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valida y compacta turismo_nacional.csv")
+    parser.add_argument("--csv", default="data/turismo_nacional.csv")
+    parser.add_argument("--out", default="data/processed")
+    args = parser.parse_args()
+
+    from utils.data import data_version
+
+    result = ingest(pd.read_csv(args.csv))
+    write_outputs(result, args.out, data_version(args.csv))
+    for row in result.report.as_rows():
+        print(f"{row['Validación']}: {row['Valor']}")
@@ -0,0 +1,90 @@
+import math
+
+import pandas as pd
+import streamlit as st
+
+# Nivel de detalle (LOD): limita lo que se envía al navegador sin importar
+# cuántas categorías o filas tenga el resultado.
+DEFAULT_TOP_K = 20
+DEFAULT_PAGE_SIZE = 25
+# Por encima de estas filas los boxplots solo dibujan los atípicos
+MAX_POINTS = 2000
+OTHERS_LABEL = "Otros"
+
+
+def top_k_with_others(df, category, value, k=DEFAULT_TOP_K, others_label=OTHERS_LABEL):
+    """Conserva las `k` categorías con mayor `value` y suma el resto en una fila `others_label`.
+
+    `df` debe tener una fila por categoría. Las demás columnas de la fila
+    "Otros" se completan con el valor común del resto, si lo hay.
+    """
+    if len(df) <= k:
+        return df
+    ordered = df.sort_values(value, ascending=False)
+    top, rest = ordered.iloc[:k], ordered.iloc[k:]
+    others = {category: f"{others_label} ({len(rest)})", value: rest[value].sum()}
+    for column in df.columns:
+        if column not in others:
+            unique = rest[column].unique()
+            others[column] = unique[0] if len(unique) == 1 else None
+    return pd.concat([top, pd.DataFrame([others], columns=df.columns)], ignore_index=True)
+
+
+def lump_others(df, category, value, k=DEFAULT_TOP_K, others_label=OTHERS_LABEL):
+    """Versión por filas de `top_k_with_others`: renombra a "Otros (n)" las filas
+    fuera de las `k` categorías con mayor `value` total (p. ej. para boxplots).
+    """
+    totals = df.groupby(category, observed=True)[value].sum()
+    if len(totals) <= k:
+        return df
+    top = totals.nlargest(k).index
+    labels = df[category].astype(object).where(
+        df[category].isin(top), f"{others_label} ({len(totals) - k})"
+    )
+    return df.assign(**{category: labels})
+
+
+def page_slice(df, page, page_size=DEFAULT_PAGE_SIZE):
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+
+def lod_controls(key):
+    """Controles de LOD en el sidebar. Devuelve el K a aplicar o None si está desactivado."""
+    with st.sidebar:
+        st.markdown("### 🔎 Nivel de Detalle")
+        activo = st.toggle(
+            "Top-K + Otros",
+            value=True,
+            key=f"{key}_lod",
+            help="Limita los gráficos de barras a las K categorías principales y agrupa el resto en 'Otros'"
+        )
+        top_k = st.slider(
+            "Categorías (K)",
+            min_value=5,
+            max_value=50,
+            value=DEFAULT_TOP_K,
+            step=5,
+            key=f"{key}_top_k",
+            disabled=not activo
+        )
+    return top_k if activo else None
+
+
+def paged_dataframe(df, key, page_size=DEFAULT_PAGE_SIZE, **kwargs):
+    """`st.dataframe` paginado en el servidor: solo se envía la página actual."""
+    total_pages = max(1, math.ceil(len(df) / page_size))
+    page = 1
+    if total_pages > 1:
+        page = st.number_input(
+            f"Página (de {total_pages})",
+            min_value=1,
+            max_value=total_pages,
+            value=1,
+            step=1,
+            key=key
+        )
+    st.dataframe(page_slice(df, page, page_size), **kwargs)
+    if total_pages > 1:
+        start = (page - 1) * page_size
+        st.caption(f"Filas {start + 1}-{min(start + page_size, len(df))} de {len(df)}")
@@ -0,0 +1,89 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import streamlit as st
+
+# Renderizado progresivo: lo barato se dibuja en el flujo normal del script y
+# lo costoso (figuras, mapa) se calcula en un pool de hilos compartido,
+# rellenando placeholders a medida que termina cada tarea.
+DEFAULT_WORKERS = 4
+
+
+@st.cache_resource
+def get_executor():
+    # Un solo pool por proceso para acotar la CPU usada por todas las sesiones
+    return ThreadPoolExecutor(
+        max_workers=int(os.environ.get("RENDER_WORKERS", DEFAULT_WORKERS)),
+        thread_name_prefix="render"
+    )
+
+
+def skeleton(placeholder, height=400):
+    """Bloque gris animado mientras se calcula el contenido (clase CSS `.skeleton` de cada página)."""
+    placeholder.markdown(
+        f'<div class="skeleton" style="height: {height}px;"></div>',
+        unsafe_allow_html=True
+    )
+
+
+def progressive_toggle(key):
+    with st.sidebar:
+        return st.toggle(
+            "Carga progresiva",
+            value=True,
+            key=f"{key}_progresivo",
+            help="Muestra primero las métricas y calcula los gráficos pesados en paralelo"
+        )
+
+
+@dataclass
+class _Task:
+    placeholder: object
+    render: object
+    future: object = None
+
+
+class ProgressiveRenderer:
+    """Reserva placeholders en orden y los rellena al terminar cada cálculo.
+
+    `compute` corre en el pool sin contexto de sesión: no debe usar elementos
+    de Streamlit ni `st.cache_*` (la caché de utils/cache.py sí es segura);
+    `render(placeholder, resultado)` corre en el hilo del script.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._tasks = []
+
+    def add(self, compute, render, height=400):
+        placeholder = st.empty()
+        task = _Task(placeholder, render)
+        if not self.enabled:
+            self._render(task, compute)
+            return placeholder
+
+        # Se envía al pool ya: calcula mientras sigue el resto del script
+        skeleton(placeholder, height)
+        task.future = get_executor().submit(compute)
+        self._tasks.append(task)
+        return placeholder
+
+    def _render(self, task, compute):
+        try:
+            result = compute()
+        except Exception as error:
+            task.placeholder.exception(error)
+        else:
+            task.render(task.placeholder, result)
+
+    def run(self):
+        """Rellena los placeholders pendientes a medida que terminan sus cálculos."""
+        tasks, self._tasks = self._tasks, []
+        futures = {task.future: task for task in tasks}
+        for future in as_completed(futures):
+            self._render(futures[future], future.result)
+
+
+def render_plotly(placeholder, fig):
+    placeholder.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import urllib.request
+
+# Lanzador del servidor: precarga la caché en este mismo proceso y luego
+# arranca Streamlit. El healthcheck solo responde OK cuando el servidor está
+# arriba y la precarga terminó (marcador READY_FILE).
+READY_FILE = os.environ.get("CACHE_READY_FILE", "/tmp/turismo_cache_ready")
+MAIN_SCRIPT = "app.py"
+DEFAULT_PORT = 8000
+
+
+def server_port():
+    """Puerto del servidor: $PORT (lo fija Render) o 8000. Lo usan el arranque y el healthcheck."""
+    return int(os.environ.get("PORT", DEFAULT_PORT))
+
+
+def preload(ready_file=READY_FILE):
+    """Carga la instantánea de la caché y el dataset procesado. Devuelve los segundos empleados."""
+    from utils.cache import get_cache_manager
+    from utils.data import load_ingest
+
+    start = time.perf_counter()
+    get_cache_manager()
+    load_ingest()
+    elapsed = time.perf_counter() - start
+    if ready_file:
+        with open(ready_file, "w") as f:
+            f.write(f"{elapsed:.3f}\n")
+    return elapsed
+
+
+def check(port):
+    """0 si el servidor responde y la caché está cargada; 1 en otro caso."""
+    if not os.path.exists(READY_FILE):
+        return 1
+    try:
+        with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=5) as response:
+            return 0 if response.status == 200 else 1
+    except OSError:
+        return 1
+
+
+def main(argv):
+    if argv[:1] == ["--check"]:
+        return check(server_port())
+
+    if os.path.exists(READY_FILE):
+        os.remove(READY_FILE)
+    elapsed = preload()
+    print(f"Caché precargada en {elapsed:.2f} s")
+
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", MAIN_SCRIPT, f"--server.port={server_port()}", *argv]
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
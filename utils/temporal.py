@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Rollups temporales precalculados por Departamento × Destino. Cada rollup
+# guarda sumas prefijas de Visitantes por periodo, de modo que el total de
+# cualquier rango es prefix[:, fin] - prefix[:, inicio] (O(1) por clave).
+DATE_COLUMN = "Fecha"
+KEY_COLUMNS = ["Departamento", "Destino"]
+GRANULARIDADES = {
+    "Día": "D",
+    "Semana": "W",
+    "Mes": "M",
+    "Año": "Y",
+}
+
+
+def has_dates(df):
+    """True si hay columna Fecha con al menos una fecha válida."""
+    return DATE_COLUMN in df.columns and bool(df[DATE_COLUMN].notna().any())
+
+
+@dataclass
+class TemporalRollup:
+    freq: str
+    periods: pd.PeriodIndex
+    keys: pd.MultiIndex
+    prefix: np.ndarray  # (n_claves, n_periodos + 1), prefix[:, 0] == 0
+    total_prefix: np.ndarray  # (n_periodos + 1,), suma de `prefix` sobre las claves
+
+    @classmethod
+    def build(cls, df, freq):
+        fechas = pd.PeriodIndex(df[DATE_COLUMN].dt.to_period(freq))
+        periods = pd.period_range(fechas.min(), fechas.max(), freq=freq)
+        period_codes = fechas.asi8 - periods[0].ordinal
+        key_codes, keys = pd.MultiIndex.from_frame(df[KEY_COLUMNS]).factorize()
+        keys = pd.MultiIndex.from_tuples(keys, names=KEY_COLUMNS)
+
+        totals = np.bincount(
+            key_codes * len(periods) + period_codes,
+            weights=df["Visitantes"].to_numpy(),
+            minlength=len(keys) * len(periods)
+        ).astype(np.int64).reshape(len(keys), len(periods))
+
+        prefix = np.zeros((len(keys), len(periods) + 1), dtype=np.int64)
+        np.cumsum(totals, axis=1, out=prefix[:, 1:])
+        return cls(freq=freq, periods=periods, keys=keys, prefix=prefix, total_prefix=prefix.sum(axis=0))
+
+    def _bounds(self, start, end):
+        """Índices [inicio, fin) en el prefijo para las fechas dadas (inclusive)."""
+        start = pd.Period(start, freq=self.freq)
+        end = pd.Period(end, freq=self.freq)
+        first = self.periods[0].ordinal
+        i = int(np.clip(start.ordinal - first, 0, len(self.periods)))
+        j = int(np.clip(end.ordinal - first + 1, 0, len(self.periods)))
+        return i, max(i, j)
+
+    def range_totals(self, start, end):
+        """Visitantes por Departamento × Destino en el rango [start, end]."""
+        i, j = self._bounds(start, end)
+        totals = self.prefix[:, j] - self.prefix[:, i]
+        return pd.DataFrame({"Visitantes": totals}, index=self.keys).reset_index()
+
+    def series(self, start, end):
+        """Serie de Visitantes totales por periodo dentro del rango."""
+        i, j = self._bounds(start, end)
+        return pd.DataFrame({
+            DATE_COLUMN: self.periods[i:j].to_timestamp(),
+            "Visitantes": np.diff(self.total_prefix[i:j + 1]),
+        })
+
+    @property
+    def nbytes(self):
+        return self.prefix.nbytes + self.total_prefix.nbytes
+
+
+def build_rollups(df):
+    """Rollups de día, semana, mes y año para un dataset con columna Fecha.
+
+    Devuelve None si no queda ninguna fecha válida.
+    """
+    df = df.dropna(subset=[DATE_COLUMN])
+    if df.empty:
+        return None
+    return {nombre: TemporalRollup.build(df, freq) for nombre, freq in GRANULARIDADES.items()}